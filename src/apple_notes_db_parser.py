@@ -0,0 +1,192 @@
+import gzip
+import os
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+# Path to a copy of the Apple Notes database. On macOS the live file is
+# ~/Library/Group Containers/group.com.apple.notes/NoteStore.sqlite; copy it
+# (plus any -wal/-shm files next to it) here instead of reading it in place.
+APPLE_NOTES_DB = './data/NoteStore.sqlite'
+
+# Core Data stores dates as seconds since 2001-01-01 UTC
+CORE_DATA_EPOCH_OFFSET = 978307200
+
+# Rows pulled from the cursor per round trip
+FETCH_BATCH_SIZE = 500
+
+# ZFOLDERTYPE of the "Recently Deleted" folder
+TRASH_FOLDER_TYPE = 1
+
+# Column names moved around between macOS releases, so use whichever exist
+CREATION_DATE_COLUMNS = ['ZCREATIONDATE3', 'ZCREATIONDATE1', 'ZCREATIONDATE']
+MODIFICATION_DATE_COLUMNS = ['ZMODIFICATIONDATE1', 'ZMODIFICATIONDATE']
+
+def open_note_store(db_path):
+    """Open NoteStore.sqlite read-only so the copy is never modified."""
+    uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+    return sqlite3.connect(uri, uri=True)
+
+def convert_core_data_date(value):
+    """Convert a Core Data timestamp to the ISO format used by parser.py"""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value + CORE_DATA_EPOCH_OFFSET).isoformat()
+
+def _read_varint(buf, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+def _proto_field(buf, field_number):
+    """Return the first length-delimited field with this number, or None."""
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            _, pos = _read_varint(buf, pos)
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            if number == field_number:
+                return buf[pos:pos + length]
+            pos += length
+        elif wire_type == 5:
+            pos += 4
+        else:
+            return None
+    return None
+
+def decode_note_body(data):
+    """
+    Decompress a ZICNOTEDATA.ZDATA blob and extract the note text.
+
+    The blob is a gzipped protobuf: NoteStoreProto.document (2) ->
+    Document.note (3) -> Note.note_text (2).
+    """
+    if not data:
+        return ""
+
+    # Some older databases store the protobuf uncompressed
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+
+    message = data
+    for field_number in (2, 3, 2):
+        message = _proto_field(message, field_number)
+        if message is None:
+            return ""
+
+    return message.decode('utf-8', errors='replace')
+
+def _table_columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+def _coalesce(columns, candidates):
+    present = [f"n.{name}" for name in candidates if name in columns]
+    if not present:
+        return "NULL"
+    if len(present) == 1:
+        return present[0]
+    return f"COALESCE({', '.join(present)})"
+
+def build_notes_query(conn):
+    """Build the single query that returns every note with its folder and body."""
+    columns = _table_columns(conn, 'ZICCLOUDSYNCINGOBJECT')
+
+    created = _coalesce(columns, CREATION_DATE_COLUMNS)
+    modified = _coalesce(columns, MODIFICATION_DATE_COLUMNS)
+    snippet = "n.ZSNIPPET" if 'ZSNIPPET' in columns else "NULL"
+    pinned = "n.ZISPINNED" if 'ZISPINNED' in columns else "0"
+    locked = "n.ZISPASSWORDPROTECTED" if 'ZISPASSWORDPROTECTED' in columns else "0"
+
+    where = ["n.ZNOTEDATA IS NOT NULL"]
+    if 'ZMARKEDFORDELETION' in columns:
+        where.append("COALESCE(n.ZMARKEDFORDELETION, 0) = 0")
+    if 'ZFOLDERTYPE' in columns:
+        where.append(f"COALESCE(f.ZFOLDERTYPE, 0) != {TRASH_FOLDER_TYPE}")
+
+    return f"""
+        SELECT
+            n.ZTITLE1,
+            f.ZTITLE2,
+            {created},
+            {modified},
+            {snippet},
+            {pinned},
+            {locked},
+            d.ZDATA
+        FROM ZICCLOUDSYNCINGOBJECT AS n
+        LEFT JOIN ZICCLOUDSYNCINGOBJECT AS f ON f.Z_PK = n.ZFOLDER
+        LEFT JOIN ZICNOTEDATA AS d ON d.Z_PK = n.ZNOTEDATA
+        WHERE {' AND '.join(where)}
+        ORDER BY n.Z_PK
+    """
+
+def iter_apple_notes_from_db(db_path=APPLE_NOTES_DB):
+    """
+    Stream parsed notes from a copied NoteStore.sqlite.
+
+    Rows are read in batches from one cursor and each body is only
+    decompressed when its note is yielded. Notes in "Recently Deleted" are
+    excluded, and password-protected notes are skipped because their
+    bodies are encrypted.
+    """
+    conn = open_note_store(db_path)
+    try:
+        cursor = conn.execute(build_notes_query(conn))
+        while True:
+            rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+            if not rows:
+                break
+
+            for title, folder, created, modified, snippet, pinned, locked, data in rows:
+                if locked:
+                    print(f"Skipping password-protected note: {title}")
+                    continue
+
+                try:
+                    content = decode_note_body(data)
+                except (OSError, EOFError, IndexError, zlib.error) as e:
+                    print(f"Error decoding {title}: {str(e)}")
+                    content = snippet or ""
+
+                yield {
+                    "title": title or "Untitled",
+                    "content": content.strip(),
+                    "labels": ["source"],  # Tag all Apple Notes with source label
+                    "created_date": convert_core_data_date(created),
+                    "modified_date": convert_core_data_date(modified),
+                    "pinned": bool(pinned),
+                    "folder": folder
+                }
+    finally:
+        conn.close()
+
+def get_all_apple_notes_from_db(db_path=APPLE_NOTES_DB):
+    """
+    Read a copied NoteStore.sqlite and return all parsed notes.
+
+    This decompresses every body up front. Only direct callers of
+    iter_apple_notes_from_db get notes one at a time.
+    """
+    if not os.path.exists(db_path):
+        print(f"Apple Notes database not found: {db_path}")
+        return []
+
+    return list(iter_apple_notes_from_db(db_path))
+
+if __name__ == "__main__":
+    notes = get_all_apple_notes_from_db()
+    print(f"Successfully parsed {len(notes)} Apple Notes.")
+    for note in notes:
+        print(f"  - {note['title']} ({note['folder']}, {note['created_date']})")
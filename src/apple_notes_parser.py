@@ -1,5 +1,7 @@
 import os
+from datetime import datetime
 from pathlib import Path
+from apple_notes_db_parser import get_all_apple_notes_from_db, APPLE_NOTES_DB
 
 # Path to Apple Notes folder
 APPLE_NOTES_DIR = './data/apple_notes'
@@ -28,10 +30,12 @@ def parse_apple_note(note_folder_path):
     
     # Read content
     content = ""
+    modified_date = None
     if md_file:
         try:
             with open(md_file, 'r', encoding='utf-8') as f:
                 content = f.read()
+            modified_date = datetime.fromtimestamp(os.path.getmtime(md_file)).isoformat()
         except Exception as e:
             print(f"Error reading {md_file}: {str(e)}")
     
@@ -42,7 +46,9 @@ def parse_apple_note(note_folder_path):
         "title": title,
         "content": content,
         "labels": ["source"],  # Tag all Apple Notes with source label
-        "created_date": None  # Apple Notes export doesn't include creation date
+        "created_date": None,  # Apple Notes export doesn't include creation date
+        "modified_date": modified_date,  # Export file time, the closest available
+        "pinned": False
     }
 
 # Scan and parse all Apple Notes
@@ -70,6 +76,17 @@ def get_all_apple_notes():
     
     return all_notes
 
+def load_apple_notes():
+    """
+    Return all Apple Notes from the best available source.
+
+    A copied NoteStore.sqlite is preferred over the markdown export since
+    it also carries creation dates. Both paths return a list.
+    """
+    if os.path.exists(APPLE_NOTES_DB):
+        return get_all_apple_notes_from_db()
+    return get_all_apple_notes()
+
 if __name__ == "__main__":
     notes = get_all_apple_notes()
     print(f"Successfully parsed {len(notes)} Apple Notes.")
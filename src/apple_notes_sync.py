@@ -1,7 +1,10 @@
+import argparse
 import os
 from dotenv import load_dotenv
 from notion_client import Client
-from apple_notes_parser import get_all_apple_notes
+from dedupe_sources import notes_for_source
+from search_index import open_index, index_note, find_page_id
+from sync_scheduler import SyncBudget, prioritize, add_schedule_arguments
 
 # Load environment variables
 load_dotenv('/Users/aaslin/Documents/GitHub/gkeep_notion_integration/.env')
@@ -15,7 +18,7 @@ if not NOTION_API_TOKEN or not NOTION_DATABASE_ID:
 notion = Client(auth=NOTION_API_TOKEN)
 
 def check_if_note_exists(title):
-    """Check if a note with this title already exists in Notion"""
+    """Return the id of a page with this title in our database, or None"""
     try:
         # Normalize database ID for comparison
         db_id_normalized = NOTION_DATABASE_ID.replace('-', '')
@@ -35,12 +38,12 @@ def check_if_note_exists(title):
                 if title_prop.get('title'):
                     result_title = title_prop['title'][0]['plain_text'] if title_prop['title'] else ""
                     if result_title == title:
-                        return True
-        return False
+                        return result['id']
+        return None
     except Exception:
-        return False
+        return None
 
-def add_note_to_notion(title, content, labels):
+def add_note_to_notion(title, content, labels, created_date=None):
     """Add an Apple Note to Notion database"""
     
     # Convert labels to multi-select format
@@ -71,6 +74,14 @@ def add_note_to_notion(title, content, labels):
         }
     }
     
+    # Add created date if available (only the NoteStore.sqlite source has it)
+    if created_date:
+        properties["Created Date"] = {
+            "date": {
+                "start": created_date
+            }
+        }
+    
     # Create the page in Notion
     page = notion.pages.create(
         parent={"database_id": NOTION_DATABASE_ID},
@@ -79,15 +90,26 @@ def add_note_to_notion(title, content, labels):
     
     return page['id']
 
-def sync_apple_notes_to_notion():
+def sync_apple_notes_to_notion(max_duration=None, max_requests=None, label_weights=None):
     """Parse all Apple Notes and sync to Notion"""
     
+    # Start the clock before parsing and merging, which count against the budget too
+    budget = SyncBudget(max_duration, max_requests)
+    
     synced_count = 0
     skipped_count = 0
     failed_count = 0
+    deferred_count = 0
+    
+    # Local index answers lookups for notes this machine already synced
+    index = open_index()
+    
+    # Get all Apple Notes, dropping those merged into a copy from another source
+    notes = notes_for_source('apple_notes')
     
-    # Get all Apple Notes
-    notes = get_all_apple_notes()
+    # Newest, pinned and heavily weighted notes first, so a run cut short
+    # by its budget still syncs what matters most
+    notes = prioritize(notes, label_weights)
     
     if not notes:
         print("No Apple Notes found to sync.")
@@ -95,21 +117,41 @@ def sync_apple_notes_to_notion():
     
     print(f"Found {len(notes)} Apple Notes\n")
     
-    for note_data in notes:
+    for position, note_data in enumerate(notes):
+        if budget.exhausted():
+            deferred_count = len(notes) - position
+            print(f"\n⏸ Budget reached, leaving {deferred_count} notes for the next run")
+            break
+        
         try:
-            # Check if note already exists
-            if check_if_note_exists(note_data['title']):
+            # Check if note already exists, locally first
+            existing_id = find_page_id(index, note_data['title'])
+            if not existing_id:
+                budget.charge()
+                existing_id = check_if_note_exists(note_data['title'])
+                
+                # Remember pages found through the API so later runs skip the lookup
+                if existing_id:
+                    index_note(index, note_data, 'apple_notes', existing_id)
+                    index.commit()
+            
+            if existing_id:
                 skipped_count += 1
                 print(f"⊘ Skipped (already exists): {note_data['title']}")
                 continue
             
             # Add to Notion
+            budget.charge()
             page_id = add_note_to_notion(
                 note_data['title'],
                 note_data['content'],
-                note_data['labels']
+                note_data['labels'],
+                note_data.get('created_date')
             )
             
+            index_note(index, note_data, 'apple_notes', page_id)
+            index.commit()
+            
             synced_count += 1
             print(f"✓ Synced: {note_data['title']} (ID: {page_id})")
             
@@ -117,10 +159,21 @@ def sync_apple_notes_to_notion():
             failed_count += 1
             print(f"✗ Failed to sync {note_data['title']}: {str(e)}")
     
+    index.close()
+    
     print(f"\n--- Sync Complete ---")
     print(f"Successfully synced: {synced_count}")
     print(f"Skipped (duplicates): {skipped_count}")
     print(f"Failed: {failed_count}")
+    print(f"Deferred to next run: {deferred_count}")
 
 if __name__ == "__main__":
-    sync_apple_notes_to_notion()
+    arg_parser = argparse.ArgumentParser(description="Sync Apple Notes to Notion")
+    add_schedule_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    sync_apple_notes_to_notion(
+        max_duration=args.max_duration,
+        max_requests=args.max_requests,
+        label_weights=dict(args.label_weight or [])
+    )
@@ -1,6 +1,8 @@
+import argparse
 import os
 from dotenv import load_dotenv
 from notion_client import Client
+from parallel_fetch import get_all_pages_parallel
 from collections import defaultdict
 
 # Load environment variables
@@ -11,7 +13,7 @@ NOTION_DATABASE_ID = os.getenv('NOTION_DATABASE_ID')
 
 notion = Client(auth=NOTION_API_TOKEN)
 
-def get_all_pages():
+def get_all_pages(parallel=False):
     """Retrieve all pages from the database"""
     all_pages = []
     has_more = True
@@ -19,6 +21,12 @@ def get_all_pages():
     
     print("📥 Fetching all pages from Notion...")
     
+    # Fetch Created Date ranges concurrently instead of one cursor at a time
+    if parallel:
+        all_pages = get_all_pages_parallel(notion, NOTION_DATABASE_ID)
+        print(f"Found {len(all_pages)} total pages\n")
+        return all_pages
+    
     # Normalize database ID (remove hyphens for comparison)
     db_id_normalized = NOTION_DATABASE_ID.replace('-', '')
     
@@ -77,9 +85,9 @@ def find_duplicates(pages):
     duplicates = {k: v for k, v in seen.items() if len(v) > 1}
     return duplicates
 
-def cleanup_duplicates():
+def cleanup_duplicates(parallel=False):
     """Remove duplicate pages, keeping only the first occurrence"""
-    pages = get_all_pages()
+    pages = get_all_pages(parallel)
     duplicates = find_duplicates(pages)
     
     if not duplicates:
@@ -113,10 +121,14 @@ def cleanup_duplicates():
     print(f"Total duplicates removed: {total_deleted}")
 
 if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Archive duplicate pages in Notion")
+    arg_parser.add_argument('--parallel', action='store_true', help="Fetch the database in concurrent Created Date ranges")
+    args = arg_parser.parse_args()
+
     print("🧹 Starting duplicate cleanup...\n")
     
     response = input("This will archive duplicate pages in Notion. Continue? (yes/no): ")
     if response.lower() in ['yes', 'y']:
-        cleanup_duplicates()
+        cleanup_duplicates(args.parallel)
     else:
         print("Cleanup cancelled.")
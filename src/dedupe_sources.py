@@ -0,0 +1,289 @@
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import struct
+from collections import defaultdict
+from datetime import datetime
+from parser import get_all_keep_notes
+from apple_notes_parser import load_apple_notes
+
+# Which source's copy wins when a note exists in several (first wins)
+SOURCE_PRIORITY = ['keep', 'apple_notes']
+
+# Estimated Jaccard similarity above which two notes count as the same
+SIMILARITY_THRESHOLD = 0.8
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Notes whose content has fewer words than this are never merged: empty,
+# image-only or emoji-only notes would all look identical
+MIN_CONTENT_WORDS = SHINGLE_SIZE
+
+# MinHash signature length, split into LSH bands of BAND_ROWS rows each.
+# 16 bands of 4 rows make pairs above ~0.5 similarity likely candidates,
+# which are then checked against SIMILARITY_THRESHOLD.
+NUM_PERM = 64
+BAND_ROWS = 4
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Signatures of previously seen notes, keyed by a hash of their text
+SIGNATURE_CACHE = './data/dedupe_signatures.sqlite'
+SIGNATURE_FORMAT = struct.Struct(f'>{NUM_PERM}Q')
+
+# Fixed seed so every run (and both sync scripts) build the same clusters
+_rng = random.Random(42)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+# Lines where a trailing signature starts
+SIGNATURE_PATTERNS = [
+    re.compile(r'^--\s*$'),
+    re.compile(r'^sent from my ', re.IGNORECASE),
+]
+
+CHECKLIST_MARKER = re.compile(r'^\s*[-*]?\s*\[[ xX]\]\s*')
+
+def normalize_text(title, content):
+    """Reduce a note to lowercase words without checklist markers or signature"""
+    lines = []
+    for line in content.splitlines():
+        if any(pattern.match(line.strip()) for pattern in SIGNATURE_PATTERNS):
+            break
+        lines.append(CHECKLIST_MARKER.sub('', line))
+
+    return re.findall(r'\w+', (title + "\n" + "\n".join(lines)).lower())
+
+def shingle(words):
+    """Hash every SHINGLE_SIZE-word window of a note to a 64-bit integer"""
+    if not words:
+        return set()
+    if len(words) < SHINGLE_SIZE:
+        windows = [words]
+    else:
+        windows = [words[i:i + SHINGLE_SIZE] for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(window).encode('utf-8'), digest_size=8).digest(), 'big')
+        for window in windows
+    }
+
+def minhash(shingles):
+    """MinHash signature of a shingle set"""
+    if not shingles:
+        return (0,) * NUM_PERM
+    return tuple(
+        min((a * value + b) % MERSENNE_PRIME for value in shingles)
+        for a, b in PERMUTATIONS
+    )
+
+def note_signature(note):
+    """MinHash signature of a note, or None if its content is too short to compare"""
+    if len(normalize_text("", note['content'])) < MIN_CONTENT_WORDS:
+        return None
+    return minhash(shingle(normalize_text(note['title'], note['content'])))
+
+def note_hash(note):
+    """Cache key for a note's signature, changing with the MinHash settings"""
+    key = f"{SHINGLE_SIZE}:{NUM_PERM}:{MIN_CONTENT_WORDS}\0{note['title']}\0{note['content']}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+def cached_signatures(notes, cache_path=None):
+    """
+    MinHash signatures for `notes`, reusing ones stored by earlier runs.
+
+    Only new or edited notes are hashed. The cache is rewritten to hold
+    exactly the current notes when anything changed.
+    """
+    cache_path = cache_path or SIGNATURE_CACHE
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    try:
+        conn.execute("CREATE TABLE IF NOT EXISTS signatures (note_hash TEXT PRIMARY KEY, signature BLOB NOT NULL)")
+        cached = dict(conn.execute("SELECT note_hash, signature FROM signatures"))
+
+        signatures = []
+        current = {}
+        for note in notes:
+            key = note_hash(note)
+            if key in cached:
+                signature = SIGNATURE_FORMAT.unpack(cached[key]) if cached[key] else None
+            else:
+                signature = note_signature(note)
+            signatures.append(signature)
+            current[key] = signature
+
+        if current.keys() != cached.keys():
+            with conn:
+                conn.execute("DELETE FROM signatures")
+                conn.executemany(
+                    "INSERT INTO signatures VALUES (?, ?)",
+                    (
+                        (key, SIGNATURE_FORMAT.pack(*signature) if signature else b'')
+                        for key, signature in current.items()
+                    )
+                )
+    finally:
+        conn.close()
+
+    return signatures
+
+def estimated_similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+def find_near_duplicate_clusters(notes, signatures=None):
+    """
+    Group notes from different sources whose text is nearly identical.
+
+    Returns lists of indexes into `notes`, one per cluster of two or more.
+    Notes sharing any LSH band bucket are compared, so the work is roughly
+    linear in the number of notes. A cluster holds at most one note per
+    source: matches are joined best first, and a note is never pulled into
+    a cluster that already has a note from its source, so two different
+    notes from one source are never merged through a third. Notes with no
+    signature (too little content) are never clustered.
+    """
+    if signatures is None:
+        signatures = [note_signature(note) for note in notes]
+
+    buckets = defaultdict(list)
+    for index, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for band in range(NUM_PERM // BAND_ROWS):
+            key = (band, signature[band * BAND_ROWS:(band + 1) * BAND_ROWS])
+            buckets[key].append(index)
+
+    # Candidate pairs from different sources that pass the similarity check
+    matches = {}
+    for members in buckets.values():
+        for pos, i in enumerate(members):
+            for j in members[pos + 1:]:
+                if (i, j) in matches or notes[i]['source'] == notes[j]['source']:
+                    continue
+                similarity = estimated_similarity(signatures[i], signatures[j])
+                if similarity >= SIMILARITY_THRESHOLD:
+                    matches[(i, j)] = similarity
+
+    # Union-find where each root tracks the sources in its cluster
+    parent = list(range(len(notes)))
+    sources = [{note['source']} for note in notes]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for (i, j), _ in sorted(matches.items(), key=lambda item: item[1], reverse=True):
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j or sources[root_i] & sources[root_j]:
+            continue
+        parent[root_j] = root_i
+        sources[root_i] |= sources[root_j]
+
+    clusters = defaultdict(list)
+    for index in range(len(notes)):
+        clusters[find(index)].append(index)
+
+    return [members for members in clusters.values() if len(members) > 1]
+
+def merge_cluster(notes):
+    """
+    Merge near-duplicate notes into the copy from the highest priority source.
+
+    Ties go to the longest content. Labels are the union of all copies and
+    the created date is the earliest one known.
+    """
+    winner = min(
+        notes,
+        key=lambda note: (SOURCE_PRIORITY.index(note['source']), -len(note['content']))
+    )
+
+    labels = []
+    for note in [winner] + notes:
+        for label in note['labels']:
+            if label not in labels:
+                labels.append(label)
+
+    dates = [note['created_date'] for note in notes if note.get('created_date')]
+    created_date = min(dates, key=datetime.fromisoformat) if dates else None
+
+    merged = dict(winner)
+    merged['labels'] = labels
+    merged['created_date'] = created_date
+    return merged
+
+def tag_sources(notes_by_source):
+    """Flatten {source: [notes]} into one list with a 'source' key per note"""
+    return [
+        dict(note, source=source)
+        for source, source_notes in notes_by_source.items()
+        for note in source_notes
+    ]
+
+def merge_near_duplicates(notes_by_source):
+    """
+    Collapse near-duplicates across sources into one note each.
+
+    Takes {source: [notes]} and returns a flat list of notes tagged with
+    their 'source', where each cluster is replaced by its merged note.
+    """
+    notes = tag_sources(notes_by_source)
+    clusters = find_near_duplicate_clusters(notes, cached_signatures(notes))
+
+    merged_notes = []
+    clustered = set()
+    for members in clusters:
+        merged_notes.append(merge_cluster([notes[i] for i in members]))
+        clustered.update(members)
+
+    merged_notes.extend(note for i, note in enumerate(notes) if i not in clustered)
+
+    if clusters:
+        print(f"Merged {len(clustered)} near-duplicate notes into {len(clusters)}\n")
+
+    return merged_notes
+
+def load_all_sources():
+    """
+    Parse every source, treating one that fails to load as empty.
+
+    A broken source then only costs its own notes (and the merging against
+    them) instead of stopping the other source's sync.
+    """
+    notes_by_source = {}
+    for source, loader in (('keep', get_all_keep_notes), ('apple_notes', load_apple_notes)):
+        try:
+            notes_by_source[source] = loader()
+        except Exception as e:
+            print(f"✗ Could not load {source} notes, continuing without them: {str(e)}")
+            notes_by_source[source] = []
+    return notes_by_source
+
+def notes_for_source(source):
+    """
+    Notes a source's sync script should upload after cross-source merging.
+
+    Both sync scripts build the same clusters, so each merged note is
+    uploaded exactly once, by the script for its winning source.
+    """
+    merged_notes = merge_near_duplicates(load_all_sources())
+    return [note for note in merged_notes if note['source'] == source]
+
+if __name__ == "__main__":
+    notes = tag_sources(load_all_sources())
+
+    clusters = find_near_duplicate_clusters(notes, cached_signatures(notes))
+    print(f"Found {len(clusters)} near-duplicate clusters in {len(notes)} notes\n")
+
+    for members in clusters:
+        merged = merge_cluster([notes[i] for i in members])
+        print(f"Keeping: {merged['title']} ({merged['source']})")
+        for i in members:
+            print(f"  - {notes[i]['title']} ({notes[i]['source']})")
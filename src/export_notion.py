@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from notion_client import Client
+from parallel_fetch import RateLimiter, get_data_source_id
+
+# Load environment variables
+load_dotenv('/Users/aaslin/Documents/GitHub/gkeep_notion_integration/.env')
+
+NOTION_API_TOKEN = os.getenv('NOTION_API_TOKEN')
+NOTION_DATABASE_ID = os.getenv('NOTION_DATABASE_ID')
+
+if not NOTION_API_TOKEN or not NOTION_DATABASE_ID:
+    raise ValueError("Missing NOTION_API_TOKEN or NOTION_DATABASE_ID in .env file")
+
+notion = Client(auth=NOTION_API_TOKEN)
+
+# Where exported markdown files and the export cursor are kept
+EXPORT_DIR = './data/notion_export'
+STATE_FILE = os.path.join(EXPORT_DIR, '.export_state.json')
+
+# Pages whose block trees are downloaded at the same time. All requests
+# share one limiter, so this only hides latency, it never goes over
+# Notion's 3 requests per second.
+EXPORT_WORKERS = 3
+
+limiter = RateLimiter()
+
+def load_state():
+    """Load the last exported last_edited_time and page id -> file map"""
+    if not os.path.exists(STATE_FILE):
+        return {"last_edited_time": None, "files": {}}
+
+    with open(STATE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(state):
+    """Write the state file atomically so an interrupted run keeps the old cursor"""
+    tmp_file = STATE_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, STATE_FILE)
+
+def get_changed_pages(since=None):
+    """Retrieve pages edited on or after `since`, oldest edit first"""
+    pages = []
+    has_more = True
+    start_cursor = None
+
+    limiter.wait()
+    query = {
+        "data_source_id": get_data_source_id(notion, NOTION_DATABASE_ID),
+        "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}],
+        "page_size": 100
+    }
+
+    # Notion rounds last_edited_time to the minute, so use on_or_after and
+    # accept re-exporting the few pages edited in the cursor's minute
+    if since:
+        query["filter"] = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": since}
+        }
+
+    while has_more:
+        if start_cursor:
+            query["start_cursor"] = start_cursor
+
+        limiter.wait()
+        response = notion.data_sources.query(**query)
+        pages.extend(response['results'])
+
+        has_more = response['has_more']
+        start_cursor = response.get('next_cursor')
+
+    return pages
+
+def get_block_children(block_id):
+    """Recursively retrieve the block tree under a page or block"""
+    blocks = []
+    has_more = True
+    start_cursor = None
+
+    while has_more:
+        limiter.wait()
+        response = notion.blocks.children.list(
+            block_id=block_id,
+            start_cursor=start_cursor,
+            page_size=100
+        )
+
+        for block in response['results']:
+            if block.get('has_children'):
+                block['children'] = get_block_children(block['id'])
+            blocks.append(block)
+
+        has_more = response['has_more']
+        start_cursor = response.get('next_cursor')
+
+    return blocks
+
+def rich_text_to_markdown(rich_text):
+    return "".join(part.get('plain_text', '') for part in rich_text)
+
+def block_to_markdown(block, depth=0):
+    """Convert a block and its children to markdown lines"""
+    block_type = block['type']
+    data = block.get(block_type, {})
+    text = rich_text_to_markdown(data.get('rich_text', []))
+    indent = '  ' * depth
+
+    if block_type == 'heading_1':
+        lines = [f"# {text}"]
+    elif block_type == 'heading_2':
+        lines = [f"## {text}"]
+    elif block_type == 'heading_3':
+        lines = [f"### {text}"]
+    elif block_type == 'bulleted_list_item':
+        lines = [f"{indent}- {text}"]
+    elif block_type == 'numbered_list_item':
+        lines = [f"{indent}1. {text}"]
+    elif block_type == 'to_do':
+        lines = [f"{indent}- [{'x' if data.get('checked') else ' '}] {text}"]
+    elif block_type == 'quote':
+        lines = [f"> {text}"]
+    elif block_type == 'code':
+        lines = [f"```{data.get('language', '')}", text, "```"]
+    elif block_type == 'divider':
+        lines = ["---"]
+    else:
+        lines = [f"{indent}{text}"] if text else []
+
+    for child in block.get('children', []):
+        lines.extend(block_to_markdown(child, depth + 1))
+
+    return lines
+
+def page_to_markdown(page, blocks):
+    """Render a page's properties and block tree as a markdown document"""
+    properties = page['properties']
+
+    title = rich_text_to_markdown(properties.get('Title', {}).get('title', [])) or "Untitled"
+    content = rich_text_to_markdown(properties.get('Content', {}).get('rich_text', []))
+    labels = [label['name'] for label in properties.get('Labels', {}).get('multi_select') or []]
+    created_date = (properties.get('Created Date', {}).get('date') or {}).get('start')
+
+    lines = [f"# {title}", ""]
+    if labels:
+        lines.append(f"- Labels: {', '.join(labels)}")
+    if created_date:
+        lines.append(f"- Created: {created_date}")
+    lines.append(f"- Last edited: {page['last_edited_time']}")
+    lines.append(f"- Notion: {page.get('url', '')}")
+    lines.append("")
+
+    if content:
+        lines.extend([content, ""])
+
+    for block in blocks:
+        lines.extend(block_to_markdown(block))
+
+    return "\n".join(lines).rstrip() + "\n", title
+
+def export_filename(title, page_id):
+    """Safe file name for a page, unique through the page id suffix"""
+    safe_title = re.sub(r'[^\w\- ]+', '', title).strip()[:80] or "Untitled"
+    return f"{safe_title} {page_id.replace('-', '')[:8]}.md"
+
+def export_page(page):
+    """Download a page's block tree and render it to markdown"""
+    blocks = get_block_children(page['id'])
+    return page_to_markdown(page, blocks)
+
+def export_notion(full=False):
+    """Export pages edited since the last run to local markdown files"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    state = load_state()
+    since = None if full else state['last_edited_time']
+
+    print(f"📥 Fetching pages edited since {since or 'the beginning'}...")
+    pages = get_changed_pages(since)
+    print(f"Found {len(pages)} changed pages\n")
+
+    exported_count = 0
+    failed_count = 0
+    failed_times = []
+
+    with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+        futures = {executor.submit(export_page, page): page for page in pages}
+
+        for future in as_completed(futures):
+            page = futures[future]
+            page_id = page['id']
+
+            try:
+                markdown, title = future.result()
+                filename = export_filename(title, page_id)
+
+                # Remove the old file if the page was renamed
+                old_filename = state['files'].get(page_id)
+                if old_filename and old_filename != filename:
+                    old_path = os.path.join(EXPORT_DIR, old_filename)
+                    if os.path.exists(old_path):
+                        os.remove(old_path)
+
+                with open(os.path.join(EXPORT_DIR, filename), 'w', encoding='utf-8') as f:
+                    f.write(markdown)
+
+                state['files'][page_id] = filename
+                exported_count += 1
+                print(f"✓ Exported: {title}")
+
+            except Exception as e:
+                failed_count += 1
+                failed_times.append(page['last_edited_time'])
+                print(f"✗ Failed to export {page_id}: {str(e)}")
+
+    # Advance the cursor, but never past a page that failed to export
+    if failed_times:
+        state['last_edited_time'] = min(failed_times)
+    elif pages:
+        state['last_edited_time'] = max(page['last_edited_time'] for page in pages)
+    save_state(state)
+
+    print(f"\n--- Export Complete ---")
+    print(f"Exported: {exported_count}")
+    print(f"Failed: {failed_count}")
+    print(f"Cursor: {state['last_edited_time']}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Export Notion pages to local markdown files")
+    arg_parser.add_argument('--full', action='store_true', help="Ignore the saved cursor and export every page")
+    args = arg_parser.parse_args()
+
+    export_notion(args.full)
@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
+
+# Notion allows an average of 3 requests per second per integration
+REQUESTS_PER_SECOND = 3
+
+# Date ranges paginated at once
+FETCH_WORKERS = 4
+
+# Property the database is partitioned on: the original note dates, which
+# are spread out even though most pages were created by a few sync runs
+PARTITION_PROPERTY = 'Created Date'
+
+class RateLimiter:
+    """Space out requests from all threads to at most `rate` per second"""
+
+    def __init__(self, rate=REQUESTS_PER_SECOND):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+def get_data_source_id(notion, database_id):
+    """
+    Return the id of the database's data source.
+
+    Since Notion-Version 2025-09-03 (the default in notion-client 2.7)
+    pages are queried through data_sources.query, not databases.query.
+    """
+    database = notion.databases.retrieve(database_id=database_id)
+    return database['data_sources'][0]['id']
+
+def page_date(page):
+    """The page's partition date as an aware datetime, or None"""
+    date = (page['properties'].get(PARTITION_PROPERTY, {}).get('date') or {}).get('start')
+    if not date:
+        return None
+    value = datetime.fromisoformat(date)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+class Window:
+    """
+    One range of the partition property being paginated.
+
+    lower is inclusive and upper exclusive; None leaves that side open.
+    empty=True selects the pages with no date instead.
+    """
+
+    def __init__(self, lower=None, upper=None, empty=False, cursor=None):
+        self.lower = lower
+        self.upper = upper
+        self.empty = empty
+        self.cursor = cursor
+
+    def query_filter(self):
+        if self.empty:
+            return {"property": PARTITION_PROPERTY, "date": {"is_empty": True}}
+
+        conditions = [{"property": PARTITION_PROPERTY, "date": {"is_not_empty": True}}]
+        if self.lower is not None:
+            conditions.append({"property": PARTITION_PROPERTY, "date": {"on_or_after": self.lower.isoformat()}})
+        if self.upper is not None:
+            conditions.append({"property": PARTITION_PROPERTY, "date": {"before": self.upper.isoformat()}})
+
+        return conditions[0] if len(conditions) == 1 else {"and": conditions}
+
+def fetch_window_page(notion, data_source_id, window, limiter):
+    """Fetch the next 100 pages of a window, oldest date first"""
+    query = {
+        "data_source_id": data_source_id,
+        "filter": window.query_filter(),
+        "page_size": 100
+    }
+    if not window.empty:
+        query["sorts"] = [{"property": PARTITION_PROPERTY, "direction": "ascending"}]
+    if window.cursor:
+        query["start_cursor"] = window.cursor
+
+    limiter.wait()
+    return notion.data_sources.query(**query)
+
+def next_windows(window, response, can_split):
+    """
+    Work left in a window after one page of results.
+
+    When a worker is free and the dates seen so far suggest at least two
+    more pages, the rest of a dated window is split in two at the middle
+    of its remaining range. Dense ranges keep getting split while they
+    have more pages, so windows end up sized by page count rather than by
+    equal slices of time.
+    """
+    if not response['has_more']:
+        return []
+
+    results = response['results']
+    if can_split and not window.empty:
+        first, last = page_date(results[0]), page_date(results[-1])
+        lower = window.lower or first
+        upper = window.upper or datetime.now(timezone.utc)
+
+        # Only split if the remainder starts past the window's start,
+        # otherwise a run of equal dates would be refetched forever
+        if lower < last < upper and first < last:
+            # Estimate what is left from how densely this page's dates lie
+            remaining = len(results) * (upper - last) / (last - first)
+            if remaining >= 2 * len(results):
+                middle = last + (upper - last) / 2
+                # Restarting at `last` refetches pages sharing that date;
+                # they are dropped by the page id deduplication
+                return [Window(last, middle), Window(middle, window.upper)]
+
+    return [Window(window.lower, window.upper, window.empty, response['next_cursor'])]
+
+def get_all_pages_parallel(notion, database_id, workers=FETCH_WORKERS):
+    """
+    Retrieve every page in the database by paginating Created Date ranges
+    concurrently under one shared rate limiter.
+
+    Pages with no Created Date are fetched as their own range. Results
+    are deduplicated by page id.
+    """
+    limiter = RateLimiter()
+
+    limiter.wait()
+    data_source_id = get_data_source_id(notion, database_id)
+
+    windows = [Window(empty=True), Window()]
+
+    pages = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {
+            executor.submit(fetch_window_page, notion, data_source_id, window, limiter): window
+            for window in windows
+        }
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                window = in_flight.pop(future)
+                response = future.result()
+
+                for page in response['results']:
+                    pages.setdefault(page['id'], page)
+
+                can_split = len(in_flight) < workers - 1
+                for follow_up in next_windows(window, response, can_split):
+                    follow_future = executor.submit(fetch_window_page, notion, data_source_id, follow_up, limiter)
+                    in_flight[follow_future] = follow_up
+
+    return list(pages.values())
@@ -26,19 +26,36 @@ def parse_keep_json(file_path):
     # Extract timestamp (Google Keep stores in microseconds)
     created_micros = data.get('createdTimestampUsec', 0)
     created_date = datetime.fromtimestamp(created_micros / 1000000).isoformat() if created_micros else None
+    edited_micros = data.get('userEditedTimestampUsec', 0)
+    modified_date = datetime.fromtimestamp(edited_micros / 1000000).isoformat() if edited_micros else None
 
     return {
         "title": title,
         "content": content,
         "labels": labels,
-        "created_date": created_date
+        "created_date": created_date,
+        "modified_date": modified_date,
+        "pinned": data.get('isPinned', False)
     }
 
-# Loop through the directory
-all_notes = []
-for filename in os.listdir(TAKEOUT_DIR):
-    if filename.endswith('.json'):
-        note_data = parse_keep_json(os.path.join(TAKEOUT_DIR, filename))
-        all_notes.append(note_data)
+def get_all_keep_notes():
+    """Parse every Keep JSON file in the Takeout folder."""
+    all_notes = []
 
-print(f"Successfully parsed {len(all_notes)} notes.")
+    if not os.path.exists(TAKEOUT_DIR):
+        print(f"Google Keep directory not found: {TAKEOUT_DIR}")
+        return all_notes
+
+    for filename in os.listdir(TAKEOUT_DIR):
+        if filename.endswith('.json'):
+            try:
+                note_data = parse_keep_json(os.path.join(TAKEOUT_DIR, filename))
+                all_notes.append(note_data)
+            except Exception as e:
+                print(f"Error parsing {filename}: {str(e)}")
+
+    return all_notes
+
+if __name__ == "__main__":
+    all_notes = get_all_keep_notes()
+    print(f"Successfully parsed {len(all_notes)} notes.")
@@ -0,0 +1,268 @@
+import argparse
+import os
+from datetime import datetime
+from functools import lru_cache
+from dotenv import load_dotenv
+from notion_client import Client
+from parallel_fetch import get_all_pages_parallel
+from parser import parse_keep_json, TAKEOUT_DIR
+
+# Load environment variables
+load_dotenv('/Users/aaslin/Documents/GitHub/gkeep_notion_integration/.env')
+
+NOTION_API_TOKEN = os.getenv('NOTION_API_TOKEN')
+NOTION_DATABASE_ID = os.getenv('NOTION_DATABASE_ID')
+
+notion = Client(auth=NOTION_API_TOKEN)
+
+def get_all_pages(parallel=False):
+    """Retrieve all pages from the database"""
+    all_pages = []
+    has_more = True
+    start_cursor = None
+    
+    print("📥 Fetching all pages from Notion...")
+    
+    # Fetch Created Date ranges concurrently instead of one cursor at a time
+    if parallel:
+        all_pages = get_all_pages_parallel(notion, NOTION_DATABASE_ID)
+        print(f"Found {len(all_pages)} pages\n")
+        return all_pages
+    
+    # Normalize database ID
+    db_id_normalized = NOTION_DATABASE_ID.replace('-', '')
+    
+    while has_more:
+        response = notion.search(
+            filter={
+                "property": "object",
+                "value": "page"
+            },
+            start_cursor=start_cursor,
+            page_size=100
+        )
+        
+        # Filter to only pages from our database
+        for page in response['results']:
+            parent_db_id = page.get('parent', {}).get('database_id', '')
+            if parent_db_id.replace('-', '') == db_id_normalized:
+                all_pages.append(page)
+        
+        has_more = response['has_more']
+        start_cursor = response.get('next_cursor')
+    
+    print(f"Found {len(all_pages)} pages\n")
+    return all_pages
+
+def extract_page_title(page):
+    """Extract title from a page"""
+    title_prop = page['properties'].get('Title', {})
+    if title_prop.get('title'):
+        return title_prop['title'][0]['plain_text'] if title_prop['title'] else ""
+    return ""
+
+def create_json_title_map():
+    """Create a map of titles to their timestamps from JSON files"""
+    title_map = {}
+    
+    print("📋 Parsing JSON files...")
+    for filename in os.listdir(TAKEOUT_DIR):
+        if filename.endswith('.json'):
+            try:
+                note_data = parse_keep_json(os.path.join(TAKEOUT_DIR, filename))
+                title = note_data['title']
+                created_date = note_data.get('created_date')
+                
+                if created_date:
+                    title_map[title] = created_date
+            except Exception as e:
+                print(f"  ✗ Error parsing {filename}: {str(e)}")
+    
+    print(f"Found {len(title_map)} notes with timestamps\n")
+    return title_map
+
+# Registered migrations, applied in registration order: (name, function)
+MIGRATIONS = []
+
+# Record fields a migration may change; build_properties maps each one
+MIGRATABLE_FIELDS = {'title', 'labels', 'created_date'}
+
+def migration(name):
+    """
+    Register a migration over a page record.
+
+    A migration receives the record (id, title, labels, created_date) and
+    returns a dict of changed fields from MIGRATABLE_FIELDS, or None when
+    the page needs nothing. Later migrations see the changes made by
+    earlier ones.
+    """
+    def register(func):
+        MIGRATIONS.append((name, func))
+        return func
+    return register
+
+def page_to_record(page):
+    """Extract the fields migrations work on from a Notion page"""
+    properties = page['properties']
+
+    labels_prop = properties.get('Labels', {})
+    labels = [label['name'] for label in labels_prop.get('multi_select') or []]
+
+    date_prop = properties.get('Created Date', {})
+    created_date = (date_prop.get('date') or {}).get('start')
+
+    return {
+        "id": page['id'],
+        "title": extract_page_title(page),
+        "labels": labels,
+        "created_date": created_date
+    }
+
+def build_properties(changes):
+    """Convert changed record fields to a Notion properties payload"""
+    properties = {}
+
+    if 'title' in changes:
+        properties["Title"] = {
+            "title": [
+                {
+                    "text": {
+                        "content": changes['title'][:100]  # Notion title has character limit
+                    }
+                }
+            ]
+        }
+
+    if 'labels' in changes:
+        properties["Labels"] = {
+            "multi_select": [{"name": label} for label in changes['labels']]
+        }
+
+    if 'created_date' in changes:
+        properties["Created Date"] = {
+            "date": {
+                "start": changes['created_date']
+            }
+        }
+
+    return properties
+
+@lru_cache(maxsize=None)
+def keep_timestamps():
+    """Title -> created date map from the Keep JSON files, parsed once per run"""
+    return create_json_title_map()
+
+def _same_time(a, b):
+    """Compare ISO dates to the second, ignoring Notion's added UTC offset"""
+    if not a or not b:
+        return False
+    a, b = datetime.fromisoformat(a), datetime.fromisoformat(b)
+    return a.replace(tzinfo=None, microsecond=0) == b.replace(tzinfo=None, microsecond=0)
+
+@migration("timestamp_backfill")
+def backfill_timestamp(record):
+    """Set Created Date from the Google Keep export when missing or different"""
+    created_date = keep_timestamps().get(record['title'])
+    if created_date and not _same_time(created_date, record['created_date']):
+        return {"created_date": created_date}
+    return None
+
+@migration("apple_notes_label")
+def rename_apple_notes_label(record):
+    """Replace the old 'Apple Notes' label with 'source'"""
+    if 'Apple Notes' not in record['labels']:
+        return None
+
+    labels = [label for label in record['labels'] if label != 'Apple Notes']
+    if 'source' not in labels:
+        labels.append('source')
+    return {"labels": labels}
+
+def apply_migrations(record, migrations):
+    """
+    Run every migration against one record.
+
+    Returns the merged field changes and the names of migrations that
+    changed something.
+    """
+    original = dict(record)
+    record = dict(record)
+    applied = []
+
+    for name, func in migrations:
+        result = func(record)
+        if result:
+            unknown = set(result) - MIGRATABLE_FIELDS
+            if unknown:
+                raise ValueError(f"Migration {name} changed unsupported fields: {', '.join(sorted(unknown))}")
+            record.update(result)
+            applied.append(name)
+
+    # Drop fields that ended up back at their original value
+    changes = {
+        field: value for field, value in record.items()
+        if value != original.get(field)
+    }
+    return changes, applied
+
+def run_migrations(names=None, dry_run=False, parallel=False):
+    """Fetch the database once and send at most one update per page"""
+    migrations = [(name, func) for name, func in MIGRATIONS if not names or name in names]
+
+    print(f"Migrations: {', '.join(name for name, _ in migrations)}\n")
+
+    pages = get_all_pages(parallel)
+
+    print("🔄 Applying migrations...\n")
+
+    updated_count = 0
+    unchanged_count = 0
+    failed_count = 0
+
+    for page in pages:
+        record = page_to_record(page)
+        title = record['title']
+
+        try:
+            changes, applied = apply_migrations(record, migrations)
+        except Exception as e:
+            failed_count += 1
+            print(f"✗ Failed to migrate {title}: {str(e)}")
+            continue
+
+        if not changes:
+            unchanged_count += 1
+            continue
+
+        try:
+            if not dry_run:
+                notion.pages.update(
+                    page_id=record['id'],
+                    properties=build_properties(changes)
+                )
+            updated_count += 1
+            print(f"✓ Updated: {title} ({', '.join(applied)})")
+
+        except Exception as e:
+            failed_count += 1
+            print(f"✗ Failed to update {title}: {str(e)}")
+
+    print(f"\n--- Migrations Complete ---")
+    print(f"Updated: {updated_count}" + (" (dry run)" if dry_run else ""))
+    print(f"Unchanged: {unchanged_count}")
+    print(f"Failed: {failed_count}")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Apply maintenance migrations to the Notion database in one pass")
+    arg_parser.add_argument(
+        '--only',
+        action='append',
+        choices=[name for name, _ in MIGRATIONS],
+        help="Run only this migration (repeatable, default: all)"
+    )
+    arg_parser.add_argument('--dry-run', action='store_true', help="Report changes without updating Notion")
+    arg_parser.add_argument('--parallel', action='store_true', help="Fetch the database in concurrent Created Date ranges")
+    args = arg_parser.parse_args()
+
+    print("🛠️  Starting maintenance migrations...\n")
+    run_migrations(args.only, args.dry_run, args.parallel)
@@ -0,0 +1,212 @@
+import argparse
+import os
+import re
+import sqlite3
+import time
+
+# Local full-text index of synced notes
+INDEX_DB = './data/notes_index.sqlite'
+
+# bm25 column weights for (title, content, labels): title matches rank first
+RANK_WEIGHTS = (10.0, 1.0, 2.0)
+
+# Bumped when the notes table changes; older indexes are dropped and rebuilt
+SCHEMA_VERSION = 2
+
+# Characters of content the sync scripts store on a page
+NOTION_CONTENT_LIMIT = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    page_id TEXT UNIQUE
+);
+
+CREATE INDEX IF NOT EXISTS notes_title ON notes (title);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title, content, labels,
+    content='notes', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Keep the FTS table in step with the notes table
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, title, content, labels)
+    VALUES (new.id, new.title, new.content, new.labels);
+END;
+
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content, labels)
+    VALUES ('delete', old.id, old.title, old.content, old.labels);
+END;
+
+CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content, labels)
+    VALUES ('delete', old.id, old.title, old.content, old.labels);
+    INSERT INTO notes_fts (rowid, title, content, labels)
+    VALUES (new.id, new.title, new.content, new.labels);
+END;
+"""
+
+def open_index(db_path=INDEX_DB):
+    """Open the search index, creating it if needed"""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+
+    # Version 1 kept one row per (source, title), so it can't be migrated
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS notes_fts; DROP TABLE IF EXISTS notes;")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    conn.executescript(SCHEMA)
+    return conn
+
+def notion_url(page_id):
+    return f"https://www.notion.so/{page_id.replace('-', '')}"
+
+def index_note(conn, note, source, page_id=None):
+    """
+    Add or update one note in the index.
+
+    Notes are keyed by their Notion page id, since titles repeat (Keep
+    names every untitled note "Untitled"). A note without a page id is
+    always added as a new row.
+    """
+    conn.execute(
+        """
+        INSERT INTO notes (source, title, content, labels, page_id)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (page_id) DO UPDATE SET
+            source = excluded.source,
+            title = excluded.title,
+            content = excluded.content,
+            labels = excluded.labels
+        """,
+        (source, note['title'], note['content'], " ".join(note['labels']), page_id)
+    )
+
+def find_page_id(conn, title):
+    """Return the Notion page id of a synced note with this title, if any"""
+    row = conn.execute(
+        "SELECT page_id FROM notes WHERE title = ? AND page_id IS NOT NULL LIMIT 1",
+        (title,)
+    ).fetchone()
+    return row[0] if row else None
+
+def to_fts_query(text):
+    """Turn free text into an FTS5 query that prefix-matches every word"""
+    words = re.findall(r'\w+', text)
+    return " ".join(f'"{word}"*' for word in words)
+
+def search_notes(conn, text, limit=10):
+    """Return the best matching notes as (title, source, page_id, snippet) rows"""
+    query = to_fts_query(text)
+    if not query:
+        return []
+
+    return conn.execute(
+        f"""
+        SELECT notes.title, notes.source, notes.page_id,
+               snippet(notes_fts, 1, '[', ']', '…', 12)
+        FROM notes_fts
+        JOIN notes ON notes.id = notes_fts.rowid
+        WHERE notes_fts MATCH ?
+        ORDER BY bm25(notes_fts, {', '.join(str(w) for w in RANK_WEIGHTS)})
+        LIMIT ?
+        """,
+        (query, limit)
+    ).fetchall()
+
+def match_page_ids(notes, pages):
+    """
+    Pair parsed notes with the Notion pages they were synced to.
+
+    `pages` is a list of (page_id, title, content). Returns the page id (or
+    None) for each note, and the pages no note claimed. Pages are matched
+    on title and content first, then on title alone, and each page goes to
+    one note only, so notes sharing a title get different pages.
+    """
+    unclaimed = {}
+    for page_id, title, content in pages:
+        unclaimed.setdefault(title, []).append((page_id, content))
+
+    page_ids = [None] * len(notes)
+    for exact in (True, False):
+        for position, note in enumerate(notes):
+            candidates = unclaimed.get(note['title'])
+            if page_ids[position] or not candidates:
+                continue
+            for candidate, (page_id, content) in enumerate(candidates):
+                if not exact or content == note['content'][:NOTION_CONTENT_LIMIT]:
+                    page_ids[position] = page_id
+                    del candidates[candidate]
+                    break
+
+    remaining = [
+        (page_id, title, content)
+        for title, candidates in unclaimed.items()
+        for page_id, content in candidates
+    ]
+    return page_ids, remaining
+
+def build_index(parallel=False):
+    """Rebuild the index from the parsed sources and the pages in Notion"""
+    # Imported here so searching never needs Notion credentials
+    from parser import get_all_keep_notes
+    from apple_notes_parser import load_apple_notes
+    from cleanup_duplicates import get_all_pages, extract_page_info
+
+    pages = [extract_page_info(page) for page in get_all_pages(parallel)]
+
+    sources = (('keep', get_all_keep_notes()), ('apple_notes', load_apple_notes()))
+    notes = [(source, note) for source, source_notes in sources for note in source_notes]
+    page_ids, notion_only = match_page_ids([note for _, note in notes], pages)
+
+    conn = open_index()
+    conn.execute("DELETE FROM notes")
+
+    for (source, note), page_id in zip(notes, page_ids):
+        index_note(conn, note, source, page_id)
+
+    # Pages created directly in Notion have no local source
+    for page_id, title, content in notion_only:
+        index_note(conn, {"title": title, "content": content, "labels": []}, 'notion', page_id)
+
+    conn.commit()
+    count = conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+    conn.close()
+
+    print(f"✓ Indexed {count} notes")
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Local full-text search over synced notes")
+    subparsers = arg_parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Rebuild the index from sources and Notion")
+    build_parser.add_argument('--parallel', action='store_true', help="Fetch the database in concurrent Created Date ranges")
+
+    search_parser = subparsers.add_parser('search', help="Search indexed notes")
+    search_parser.add_argument('query')
+    search_parser.add_argument('--limit', type=int, default=10)
+
+    args = arg_parser.parse_args()
+
+    if args.command == 'build':
+        build_index(args.parallel)
+    else:
+        conn = open_index()
+        start = time.perf_counter()
+        results = search_notes(conn, args.query, args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        for title, source, page_id, snippet in results:
+            print(f"• {title} ({source})")
+            print(f"  {snippet}")
+            print(f"  {notion_url(page_id) if page_id else 'not synced'}")
+
+        print(f"\n{len(results)} results in {elapsed_ms:.1f} ms")
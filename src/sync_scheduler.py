@@ -0,0 +1,77 @@
+import argparse
+import time
+from datetime import datetime
+
+# Worst-case API calls to sync one note: a notion.search lookup and a create
+REQUESTS_PER_NOTE = 2
+
+class SyncBudget:
+    """
+    Stop a sync run once it has used its time or request allowance.
+
+    Unsynced notes are picked up by the next run, since notes that already
+    exist in Notion are skipped.
+    """
+
+    def __init__(self, max_duration=None, max_requests=None):
+        self.max_duration = max_duration
+        self.max_requests = max_requests
+        self.requests = 0
+        self.start = time.monotonic()
+
+    def charge(self, requests=1):
+        """Record API calls made against the budget"""
+        self.requests += requests
+
+    def exhausted(self, next_cost=REQUESTS_PER_NOTE):
+        """True if the next unit of work could go over the budget"""
+        if self.max_duration is not None and time.monotonic() - self.start >= self.max_duration:
+            return True
+        if self.max_requests is not None and self.requests + next_cost > self.max_requests:
+            return True
+        return False
+
+def _timestamp(date_string):
+    if not date_string:
+        return 0
+    try:
+        return datetime.fromisoformat(date_string).timestamp()
+    except ValueError:
+        return 0
+
+def note_priority(note, label_weights=None):
+    """
+    Sort key for a note: pinned first, then label weight, then most
+    recently modified (falling back to created date).
+    """
+    label_weights = label_weights or {}
+    label_score = sum(label_weights.get(label, 0) for label in note['labels'])
+    modified = _timestamp(note.get('modified_date') or note.get('created_date'))
+
+    return (bool(note.get('pinned')), label_score, modified)
+
+def prioritize(notes, label_weights=None):
+    """Return notes in the order they should be synced"""
+    return sorted(notes, key=lambda note: note_priority(note, label_weights), reverse=True)
+
+def label_weight(value):
+    """argparse type for LABEL=WEIGHT, returning a (label, weight) pair"""
+    label, _, weight = value.rpartition('=')
+    if not label:
+        raise argparse.ArgumentTypeError(f"expected LABEL=WEIGHT, got {value!r}")
+    try:
+        return label, float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"weight must be a number, got {weight!r}")
+
+def add_schedule_arguments(arg_parser):
+    """Add the budget and priority options shared by the sync scripts"""
+    arg_parser.add_argument('--max-duration', type=float, help="Stop starting new notes after this many seconds")
+    arg_parser.add_argument('--max-requests', type=int, help="Stop before making more than this many API requests")
+    arg_parser.add_argument(
+        '--label-weight',
+        action='append',
+        type=label_weight,
+        metavar='LABEL=WEIGHT',
+        help="Sync notes with this label earlier (repeatable)"
+    )
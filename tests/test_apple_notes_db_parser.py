@@ -0,0 +1,103 @@
+import gzip
+import sqlite3
+
+import pytest
+
+from apple_notes_db_parser import get_all_apple_notes_from_db, iter_apple_notes_from_db, open_note_store
+
+# 2023-03-08 20:26:40 UTC as a Core Data timestamp
+CREATED = 700000000
+MODIFIED = 700000100
+
+def _varint(value):
+    out = b''
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out += bytes([byte | 0x80])
+        else:
+            return out + bytes([byte])
+
+def _field(number, payload):
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+def note_body(text):
+    """Build a ZDATA blob the way Notes stores it: gzipped NoteStoreProto"""
+    note = _varint(1 << 3) + _varint(0) + _field(2, text.encode('utf-8'))
+    document = _varint(1 << 3) + _varint(0) + _field(3, note)
+    return gzip.compress(_varint(1 << 3) + _varint(1) + _field(2, document))
+
+@pytest.fixture
+def note_store(tmp_path):
+    """A minimal NoteStore.sqlite with the columns the parser reads"""
+    db_path = tmp_path / 'NoteStore.sqlite'
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE ZICCLOUDSYNCINGOBJECT (
+            Z_PK INTEGER PRIMARY KEY, ZTITLE1, ZTITLE2, ZFOLDER, ZFOLDERTYPE,
+            ZNOTEDATA, ZCREATIONDATE1, ZCREATIONDATE3, ZMODIFICATIONDATE1,
+            ZSNIPPET, ZMARKEDFORDELETION, ZISPINNED, ZISPASSWORDPROTECTED
+        );
+        CREATE TABLE ZICNOTEDATA (Z_PK INTEGER PRIMARY KEY, ZNOTE, ZDATA);
+    """)
+
+    folders = [(1, 'Notes', 0), (2, 'Recently Deleted', 1)]
+    conn.executemany(
+        "INSERT INTO ZICCLOUDSYNCINGOBJECT (Z_PK, ZTITLE2, ZFOLDERTYPE) VALUES (?, ?, ?)",
+        folders
+    )
+
+    # (pk, title, folder, snippet, deleted, pinned, locked, body)
+    notes = [
+        (10, 'Groceries', 1, 'milk', 0, 1, 0, note_body("Groceries\nmilk ü")),
+        (11, 'Marked deleted', 1, '', 1, 0, 0, note_body("gone")),
+        (12, 'In trash', 2, '', 0, 0, 0, note_body("trash")),
+        (13, 'Locked', 1, '', 0, 0, 1, b'\x1f\x8bencrypted'),
+        (14, 'Corrupt', 1, 'snippet text', 0, 0, 0, b'\x1f\x8bnot gzip'),
+    ]
+    for pk, title, folder, snippet, deleted, pinned, locked, body in notes:
+        conn.execute(
+            """
+            INSERT INTO ZICCLOUDSYNCINGOBJECT
+                (Z_PK, ZTITLE1, ZFOLDER, ZNOTEDATA, ZCREATIONDATE3, ZMODIFICATIONDATE1,
+                 ZSNIPPET, ZMARKEDFORDELETION, ZISPINNED, ZISPASSWORDPROTECTED)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (pk, title, folder, pk, CREATED, MODIFIED, snippet, deleted, pinned, locked)
+        )
+        conn.execute("INSERT INTO ZICNOTEDATA VALUES (?, ?, ?)", (pk, pk, body))
+
+    conn.commit()
+    conn.close()
+    return db_path
+
+def test_reads_notes_with_folder_dates_and_body(note_store):
+    notes = {note['title']: note for note in get_all_apple_notes_from_db(note_store)}
+
+    groceries = notes['Groceries']
+    assert groceries['content'] == "Groceries\nmilk ü"
+    assert groceries['folder'] == 'Notes'
+    assert groceries['labels'] == ['source']
+    assert groceries['pinned'] is True
+    assert groceries['created_date'] is not None
+    assert groceries['modified_date'] > groceries['created_date']
+
+def test_skips_deleted_trashed_and_locked_notes(note_store):
+    titles = [note['title'] for note in get_all_apple_notes_from_db(note_store)]
+
+    assert titles == ['Groceries', 'Corrupt']
+
+def test_undecodable_body_falls_back_to_snippet(note_store):
+    notes = {note['title']: note for note in iter_apple_notes_from_db(note_store)}
+
+    assert notes['Corrupt']['content'] == 'snippet text'
+
+def test_database_is_opened_read_only(note_store):
+    conn = open_note_store(note_store)
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM ZICNOTEDATA")
+    conn.close()
+
+def test_missing_database_returns_no_notes(tmp_path):
+    assert get_all_apple_notes_from_db(tmp_path / 'missing.sqlite') == []
@@ -0,0 +1,67 @@
+from dedupe_sources import cached_signatures, find_near_duplicate_clusters, merge_near_duplicates, tag_sources
+
+GROCERIES = "milk\neggs\nbread\nbutter and jam\napples oranges pears bananas\nrice beans lentils"
+
+def note(title, content, labels=(), created_date=None):
+    return {"title": title, "content": content, "labels": list(labels), "created_date": created_date}
+
+def test_formatting_differences_merge_across_sources(tmp_path, monkeypatch):
+    monkeypatch.setattr('dedupe_sources.SIGNATURE_CACHE', str(tmp_path / 'cache.sqlite'))
+    keep_content = "\n".join(f"[x] {line}" for line in GROCERIES.splitlines())
+    apple_content = GROCERIES.replace("\n", "\n  ") + "\n\nSent from my iPhone"
+
+    merged = merge_near_duplicates({
+        'keep': [note('Groceries', keep_content, ['food'], '2020-01-01T00:00:00')],
+        'apple_notes': [note('Groceries', apple_content, ['source'], '2019-05-01T00:00:00')],
+    })
+
+    assert len(merged) == 1
+    assert merged[0]['source'] == 'keep'
+    assert merged[0]['labels'] == ['food', 'source']
+    assert merged[0]['created_date'] == '2019-05-01T00:00:00'
+
+def test_same_source_notes_are_not_chained_through_another_source():
+    notes = tag_sources({
+        'keep': [
+            note('Groceries', GROCERIES, ['food']),
+            note('Groceries', GROCERIES + "\nflour", ['weekly']),
+        ],
+        'apple_notes': [note('Groceries', GROCERIES, ['source'])],
+    })
+
+    clusters = find_near_duplicate_clusters(notes)
+
+    assert len(clusters) == 1
+    assert sorted(notes[i]['source'] for i in clusters[0]) == ['apple_notes', 'keep']
+
+def test_unrelated_notes_stay_separate():
+    notes = tag_sources({
+        'keep': [note('Trip', "flights to spain in june and a hotel near the beach")],
+        'apple_notes': [note('Recipe', "two cups of flour one egg and a pinch of salt")],
+    })
+
+    assert find_near_duplicate_clusters(notes) == []
+
+def test_signature_cache_reuses_stored_signatures(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / 'cache.sqlite')
+    notes = [note('Groceries', GROCERIES)]
+    first = cached_signatures(notes, cache_path)
+
+    def fail(note):
+        raise AssertionError("signature should come from the cache")
+
+    monkeypatch.setattr('dedupe_sources.note_signature', fail)
+    assert cached_signatures(notes, cache_path) == first
+
+def test_notes_without_words_are_not_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr('dedupe_sources.SIGNATURE_CACHE', str(tmp_path / 'cache.sqlite'))
+
+    notes_by_source = {
+        'keep': [note('Untitled', "🙂"), note('Shopping', "ok")],
+        'apple_notes': [note('Untitled', "🎉"), note('Shopping', "ok")],
+    }
+
+    # The second run reads the signatures back from the cache
+    for _ in range(2):
+        merged = merge_near_duplicates(notes_by_source)
+        assert sorted(note['source'] for note in merged) == ['apple_notes', 'apple_notes', 'keep', 'keep']
@@ -0,0 +1,92 @@
+import json
+import os
+import pytest
+
+# export_notion creates the Notion client at import time
+pytest.importorskip('dotenv')
+pytest.importorskip('notion_client')
+os.environ.setdefault('NOTION_API_TOKEN', 'test-token')
+os.environ.setdefault('NOTION_DATABASE_ID', 'test-database')
+import export_notion
+from export_notion import block_to_markdown, export_filename
+
+def page(page_id, title, last_edited_time):
+    return {
+        "id": page_id,
+        "last_edited_time": last_edited_time,
+        "properties": {"Title": {"title": [{"plain_text": title}]}}
+    }
+
+def paragraph(text, block_type='paragraph', **data):
+    return {"type": block_type, block_type: dict(data, rich_text=[{"plain_text": text}])}
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_notion, 'EXPORT_DIR', str(tmp_path))
+    monkeypatch.setattr(export_notion, 'STATE_FILE', str(tmp_path / '.export_state.json'))
+    return tmp_path
+
+def stub_export(monkeypatch, pages, failing_ids=()):
+    monkeypatch.setattr(export_notion, 'get_changed_pages', lambda since=None: pages)
+
+    def export_page(page):
+        if page['id'] in failing_ids:
+            raise RuntimeError("block fetch failed")
+        return f"# {page['id']}\n", page['properties']['Title']['title'][0]['plain_text']
+
+    monkeypatch.setattr(export_notion, 'export_page', export_page)
+
+def saved_state(export_dir):
+    with open(export_dir / '.export_state.json', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_cursor_stops_at_the_earliest_failed_page(export_dir, monkeypatch):
+    pages = [
+        page('aaaaaaaa-1', 'First', '2024-01-01T10:00:00.000Z'),
+        page('bbbbbbbb-2', 'Broken', '2024-01-02T10:00:00.000Z'),
+        page('cccccccc-3', 'Last', '2024-01-03T10:00:00.000Z'),
+    ]
+    stub_export(monkeypatch, pages, failing_ids={'bbbbbbbb-2'})
+
+    export_notion.export_notion()
+
+    state = saved_state(export_dir)
+    assert state['last_edited_time'] == '2024-01-02T10:00:00.000Z'
+    assert sorted(state['files']) == ['aaaaaaaa-1', 'cccccccc-3']
+    assert sorted(os.listdir(export_dir)) == ['.export_state.json', 'First aaaaaaaa.md', 'Last cccccccc.md']
+
+def test_cursor_moves_to_the_latest_edit_when_all_pages_export(export_dir, monkeypatch):
+    stub_export(monkeypatch, [
+        page('aaaaaaaa-1', 'First', '2024-01-01T10:00:00.000Z'),
+        page('cccccccc-3', 'Last', '2024-01-03T10:00:00.000Z'),
+    ])
+
+    export_notion.export_notion()
+
+    assert saved_state(export_dir)['last_edited_time'] == '2024-01-03T10:00:00.000Z'
+
+def test_renamed_page_replaces_its_old_file(export_dir, monkeypatch):
+    old_filename = export_filename('Old name', 'aaaaaaaa-1')
+    (export_dir / old_filename).write_text("# Old name\n", encoding='utf-8')
+    with open(export_dir / '.export_state.json', 'w', encoding='utf-8') as f:
+        json.dump({"last_edited_time": None, "files": {"aaaaaaaa-1": old_filename}}, f)
+    stub_export(monkeypatch, [page('aaaaaaaa-1', 'New name', '2024-01-01T10:00:00.000Z')])
+
+    export_notion.export_notion()
+
+    assert sorted(os.listdir(export_dir)) == ['.export_state.json', 'New name aaaaaaaa.md']
+    assert saved_state(export_dir)['files'] == {"aaaaaaaa-1": 'New name aaaaaaaa.md'}
+
+def test_block_to_markdown_nests_children():
+    block = paragraph('Packing', 'bulleted_list_item')
+    block['children'] = [
+        paragraph('Passport', 'to_do', checked=True),
+        paragraph('Charger', 'to_do', checked=False),
+    ]
+
+    assert block_to_markdown(block) == ["- Packing", "  - [x] Passport", "  - [ ] Charger"]
+
+def test_block_to_markdown_headings_and_code():
+    assert block_to_markdown(paragraph('Trip', 'heading_2')) == ["## Trip"]
+    assert block_to_markdown(paragraph('print(1)', 'code', language='python')) == ["```python", "print(1)", "```"]
+    assert block_to_markdown({"type": "divider", "divider": {}}) == ["---"]
@@ -0,0 +1,131 @@
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import pytest
+import parallel_fetch
+from parallel_fetch import Window, get_all_pages_parallel, next_windows, page_date
+
+class FakeDataSources:
+    """In-memory data_sources.query that applies the date filters and sort"""
+
+    def __init__(self, pages, max_queries=2000):
+        self.pages = pages
+        self.max_queries = max_queries
+        self.queries = 0
+        self.lock = threading.Lock()
+
+    def matches(self, page, condition):
+        if 'and' in condition:
+            return all(self.matches(page, part) for part in condition['and'])
+
+        date = page_date(page)
+        (operator, value), = condition['date'].items()
+        if operator == 'is_empty':
+            return date is None
+        if operator == 'is_not_empty':
+            return date is not None
+        if date is None:
+            return False
+        bound = datetime.fromisoformat(value)
+        return date >= bound if operator == 'on_or_after' else date < bound
+
+    def query(self, data_source_id, filter, page_size, sorts=None, start_cursor=None):
+        with self.lock:
+            self.queries += 1
+            assert self.queries <= self.max_queries, "fetch did not converge"
+
+        results = [page for page in self.pages if self.matches(page, filter)]
+        if sorts:
+            results.sort(key=page_date)
+
+        offset = int(start_cursor or 0)
+        end = offset + page_size
+        return {
+            "results": results[offset:end],
+            "has_more": end < len(results),
+            "next_cursor": str(end) if end < len(results) else None
+        }
+
+class FakeNotion:
+    def __init__(self, pages):
+        self.data_sources = FakeDataSources(pages)
+        self.databases = self
+
+    def retrieve(self, database_id):
+        return {"data_sources": [{"id": "data-source"}]}
+
+def page(number, date):
+    return {"id": f"page-{number}", "properties": {"Created Date": {"date": {"start": date} if date else None}}}
+
+def skewed_pages(count=3000):
+    """Mostly recent dates, one bulk-imported date and some pages with no date"""
+    rng = random.Random(7)
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    pages = []
+    for number in range(count):
+        kind = number % 10
+        if kind == 0:
+            date = None
+        elif kind in (1, 2, 3):
+            date = '2021-03-14T09:30:00.000+00:00'
+        elif kind == 4:
+            # Date-only and naive values are read as UTC
+            date = (now - timedelta(days=rng.randrange(5000))).date().isoformat()
+        else:
+            date = (now - timedelta(days=rng.expovariate(1 / 60))).isoformat()
+        pages.append(page(number, date))
+    rng.shuffle(pages)
+    return pages
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    monkeypatch.setattr(parallel_fetch.RateLimiter, 'wait', lambda self: None)
+
+def test_every_page_is_returned_exactly_once():
+    pages = skewed_pages()
+    notion = FakeNotion(pages)
+
+    fetched = get_all_pages_parallel(notion, 'database')
+
+    ids = Counter(page['id'] for page in fetched)
+    assert set(ids) == {page['id'] for page in pages}
+    assert max(ids.values()) == 1
+
+def test_single_worker_returns_every_page():
+    pages = skewed_pages(1000)
+
+    fetched = get_all_pages_parallel(FakeNotion(pages), 'database', workers=1)
+
+    assert sorted(page['id'] for page in fetched) == sorted(page['id'] for page in pages)
+
+def test_run_of_equal_dates_is_paged_not_split():
+    date = '2021-03-14T09:30:00+00:00'
+    response = {"results": [page(n, date) for n in range(100)], "has_more": True, "next_cursor": "100"}
+
+    follow_up, = next_windows(Window(), response, can_split=True)
+
+    assert follow_up.cursor == "100"
+    assert follow_up.lower is None and follow_up.upper is None
+
+def test_sparse_window_is_split_at_the_middle_of_the_rest():
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    upper = datetime(2021, 1, 1, tzinfo=timezone.utc)
+    results = [page(n, (start + timedelta(hours=n)).isoformat()) for n in range(100)]
+    response = {"results": results, "has_more": True, "next_cursor": "100"}
+
+    first, second = next_windows(Window(start, upper), response, can_split=True)
+
+    last = start + timedelta(hours=99)
+    assert (first.lower, first.upper) == (last, second.lower)
+    assert second.upper == upper
+    assert first.cursor is None and second.cursor is None
+
+def test_no_split_without_a_free_worker():
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    results = [page(n, (start + timedelta(hours=n)).isoformat()) for n in range(100)]
+    response = {"results": results, "has_more": True, "next_cursor": "100"}
+
+    follow_up, = next_windows(Window(start, start + timedelta(days=365)), response, can_split=False)
+
+    assert follow_up.cursor == "100"
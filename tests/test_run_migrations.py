@@ -0,0 +1,48 @@
+import pytest
+
+# run_migrations creates the Notion client at import time
+pytest.importorskip('dotenv')
+pytest.importorskip('notion_client')
+from run_migrations import apply_migrations
+
+def record(**fields):
+    return dict({"id": "page-1", "title": "Groceries", "labels": ["Apple Notes"], "created_date": None}, **fields)
+
+def test_changes_from_several_migrations_are_merged():
+    migrations = [
+        ("labels", lambda record: {"labels": ["source"]}),
+        ("date", lambda record: {"created_date": "2020-01-01T00:00:00"}),
+        ("unchanged", lambda record: None),
+    ]
+
+    changes, applied = apply_migrations(record(), migrations)
+
+    assert changes == {"labels": ["source"], "created_date": "2020-01-01T00:00:00"}
+    assert applied == ["labels", "date"]
+
+def test_later_migrations_see_earlier_changes():
+    migrations = [
+        ("rename", lambda record: {"title": "Shopping"}),
+        ("tag", lambda record: {"labels": [record['title']]}),
+    ]
+
+    changes, _ = apply_migrations(record(), migrations)
+
+    assert changes == {"title": "Shopping", "labels": ["Shopping"]}
+
+def test_field_set_back_to_original_is_dropped():
+    migrations = [
+        ("rename", lambda record: {"title": "Shopping"}),
+        ("restore", lambda record: {"title": "Groceries"}),
+    ]
+
+    changes, applied = apply_migrations(record(), migrations)
+
+    assert changes == {}
+    assert applied == ["rename", "restore"]
+
+def test_unknown_field_raises():
+    migrations = [("bad", lambda record: {"content": "new body"})]
+
+    with pytest.raises(ValueError, match="content"):
+        apply_migrations(record(), migrations)
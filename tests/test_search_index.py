@@ -0,0 +1,68 @@
+import sqlite3
+from search_index import open_index, index_note, find_page_id, match_page_ids, search_notes
+
+UNTITLED = [
+    {"title": "Untitled", "content": "buy oat milk and coffee", "labels": []},
+    {"title": "Untitled", "content": "dentist appointment on tuesday", "labels": []},
+    {"title": "Untitled", "content": "renew passport before june", "labels": []},
+]
+
+def matching_titles(conn, text):
+    return [(title, page_id) for title, _, page_id, _ in search_notes(conn, text)]
+
+def test_notes_sharing_a_title_are_each_searchable(tmp_path):
+    conn = open_index(str(tmp_path / 'index.sqlite'))
+    for position, note in enumerate(UNTITLED):
+        index_note(conn, note, 'keep', f"page-{position}")
+
+    assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 3
+    assert matching_titles(conn, "milk") == [("Untitled", "page-0")]
+    assert matching_titles(conn, "dentist") == [("Untitled", "page-1")]
+    assert matching_titles(conn, "passport") == [("Untitled", "page-2")]
+    assert find_page_id(conn, "Untitled") in {"page-0", "page-1", "page-2"}
+
+def test_unsynced_notes_sharing_a_title_are_kept(tmp_path):
+    conn = open_index(str(tmp_path / 'index.sqlite'))
+    for note in UNTITLED:
+        index_note(conn, note, 'keep')
+
+    assert matching_titles(conn, "dentist") == [("Untitled", None)]
+    assert find_page_id(conn, "Untitled") is None
+
+def test_reindexing_a_page_updates_its_row(tmp_path):
+    conn = open_index(str(tmp_path / 'index.sqlite'))
+    index_note(conn, UNTITLED[0], 'keep', "page-0")
+    index_note(conn, dict(UNTITLED[0], content="buy soy milk"), 'keep', "page-0")
+
+    assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 1
+    assert matching_titles(conn, "coffee") == []
+    assert matching_titles(conn, "soy") == [("Untitled", "page-0")]
+
+def test_pages_are_matched_by_content_before_title():
+    pages = [
+        ("page-passport", "Untitled", "renew passport before june"),
+        ("page-milk", "Untitled", "buy oat milk and coffee"),
+        ("page-extra", "Untitled", "created in notion"),
+        ("page-trip", "Trip", "flights"),
+    ]
+    notes = UNTITLED + [{"title": "Untitled", "content": "edited since the sync", "labels": []}]
+
+    page_ids, remaining = match_page_ids(notes, pages)
+
+    assert page_ids[0] == "page-milk"
+    assert page_ids[2] == "page-passport"
+    assert {page_ids[1], page_ids[3]} == {"page-extra", None}
+    assert remaining == [("page-trip", "Trip", "flights")]
+
+def test_old_title_keyed_index_is_rebuilt(tmp_path):
+    db_path = str(tmp_path / 'index.sqlite')
+    old = sqlite3.connect(db_path)
+    old.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, source TEXT, title TEXT, content TEXT, labels TEXT, page_id TEXT, UNIQUE (source, title))")
+    old.commit()
+    old.close()
+
+    conn = open_index(db_path)
+    for position, note in enumerate(UNTITLED):
+        index_note(conn, note, 'keep', f"page-{position}")
+
+    assert conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0] == 3
@@ -0,0 +1,61 @@
+import argparse
+import pytest
+from sync_scheduler import SyncBudget, prioritize, label_weight, add_schedule_arguments
+
+def note(title, labels=(), pinned=False, modified_date=None, created_date=None):
+    return {
+        "title": title,
+        "labels": list(labels),
+        "pinned": pinned,
+        "modified_date": modified_date,
+        "created_date": created_date
+    }
+
+def test_pinned_then_label_weight_then_recency():
+    notes = [
+        note('old', modified_date='2020-01-01T00:00:00'),
+        note('recent', modified_date='2024-01-01T00:00:00'),
+        note('created only', created_date='2022-01-01T00:00:00'),
+        note('work', ['Work'], modified_date='2019-01-01T00:00:00'),
+        note('pinned', pinned=True, modified_date='2018-01-01T00:00:00'),
+        note('undated'),
+    ]
+
+    ordered = [n['title'] for n in prioritize(notes, {'Work': 5.0})]
+
+    assert ordered == ['pinned', 'work', 'recent', 'created only', 'old', 'undated']
+
+def test_request_budget_allows_the_last_note_that_fits():
+    budget = SyncBudget(max_requests=10)
+
+    budget.charge(8)
+    assert not budget.exhausted(next_cost=2)
+
+    budget.charge()
+    assert budget.exhausted(next_cost=2)
+    assert not budget.exhausted(next_cost=1)
+
+def test_no_limits_never_exhaust():
+    budget = SyncBudget()
+    budget.charge(1000)
+    assert not budget.exhausted()
+
+def test_duration_budget():
+    assert SyncBudget(max_duration=0).exhausted()
+    assert not SyncBudget(max_duration=60).exhausted()
+
+def test_label_weight_parses_the_last_equals_sign():
+    assert label_weight('Work=2') == ('Work', 2.0)
+    assert label_weight('a=b=0.5') == ('a=b', 0.5)
+
+@pytest.mark.parametrize('value', ['Work', 'Work=abc', '=2'])
+def test_label_weight_rejects_malformed_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        label_weight(value)
+
+def test_malformed_label_weight_is_a_usage_error():
+    arg_parser = argparse.ArgumentParser()
+    add_schedule_arguments(arg_parser)
+
+    with pytest.raises(SystemExit):
+        arg_parser.parse_args(['--label-weight', 'Work'])